@@ -1,76 +1,122 @@
 import asyncio
 import html as html_lib
 import io
-import json
 import os
+import random
 import re
 import time
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import urljoin, urlparse, urlsplit
 
 import aiohttp
+import orjson
+import uvloop
 from aiohttp import ClientTimeout
 from openai import AsyncOpenAI
 from pypdf import PdfReader
 
+T = TypeVar("T")
+
 BOT_TOKEN = os.getenv("BOT_TOKEN", "").strip()
 CHAT_ID = os.getenv("CHAT_ID", "").strip()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "").strip()
 
 SOURCES_FILE = "sources.json"
 STATE_FILE = "state.json"
+HTTP_CACHE_FILE = "http_cache.json"
 
 HTTP_TIMEOUT_SECONDS = 30
+HTTP_CONNECT_TIMEOUT_SECONDS = 10
+HTTP_KEEPALIVE_SECONDS = 30
+HTTP_DNS_CACHE_SECONDS = 300
 HTTP_RETRIES = 3
 HTTP_RETRY_BACKOFF = 1.6
+HTTP_RETRYABLE_STATUSES = (408, 425, 429)
+HTTP_RETRY_DEADLINE_SECONDS = 45
+HTTP_RETRY_AFTER_MAX_SECONDS = 30
 TELEGRAM_MAX_CHARS = 3500
 TELEGRAM_RETRIES = 5
 
 OPENAI_MODEL = "gpt-5.4"
 OPENAI_MAX_CONCURRENT = 2
+OPENAI_BATCH_SIZE = 10
+OPENAI_TIMEOUT_SECONDS = 120
+
+SOURCES_MAX_CONCURRENT = 8
+SOURCES_MAX_CONCURRENT_PER_HOST = 2
+HTTP_MAX_CONNECTIONS = SOURCES_MAX_CONCURRENT * 4
+HTTP_MAX_CONNECTIONS_PER_HOST = SOURCES_MAX_CONCURRENT * 2
 
 MAX_DOC_LINKS_PER_SOURCE = 80
+MIN_ANCHOR_TITLE_CHARS = 15
+URL_CLASSIFY_CACHE_SIZE = 4096
+HTML_MAX_BYTES = 1024 * 1024
+DOC_HTML_STOP_MARKER = b"</main>"
+DOC_FETCH_MAX_CONCURRENT_PER_HOST = 6
+LIMITER_DECREASE_FACTOR = 0.7
+HOST_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "publication.pravo.gov.ru": (3.0, 6),
+    "cbr.ru": (3.0, 6),
+    "api.telegram.org": (1.0, 20),
+}
+
+SEEN_MAX_PER_REGULATOR = 5000
 
 USER_AGENT = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 )
 
+DROP_URL_PREFIXES = ("tel:", "mailto:")
+
+DROP_URL_SUBSTRINGS = (
+    "vk.com/",
+    "t.me/",
+    "youtube.com/",
+    "rutube.ru/",
+    "ok.ru/",
+    "zen.yandex.ru/",
+    "/sitemap",
+    "/contact",
+    "/about",
+    "/vacancies",
+    "/press",
+    "/localization/",
+    "/switchlanguage",
+    "/help",
+    "/opendata",
+    "/htmlconstructor",
+    "/calendar/",
+    "/search/",
+    "/_nuxt/",
+)
+
 DROP_URL_PATTERNS = [
-    r"^tel:",
-    r"^mailto:",
-    r"vk\.com/",
-    r"t\.me/",
-    r"youtube\.com/",
-    r"rutube\.ru/",
-    r"ok\.ru/",
-    r"zen\.yandex\.ru/",
-    r"/sitemap",
-    r"/contacts",
-    r"/contact",
-    r"/about",
-    r"/vacancies",
-    r"/press",
-    r"/press-center",
     r"/news(?!/)",
-    r"/Localization/",
-    r"/SwitchLanguage",
-    r"/help",
-    r"/OpenData",
-    r"/HtmlConstructor",
-    r"/calendar/",
-    r"/search/",
     r"/documents/(daily|weekly|monthly)\b",
     r"/documents/block/[^?]+(\?index=\d+)?$",
-    r"/_nuxt/",
 ]
 
-DROP_EXTENSIONS = {
+DROP_EXTENSIONS = (
     ".js", ".css", ".map", ".png", ".jpg", ".jpeg", ".gif", ".svg",
     ".webp", ".ico", ".woff", ".woff2", ".ttf", ".eot", ".json", ".xml"
-}
+)
 
 DOC_URL_PATTERNS = [
     r"https?://publication\.pravo\.gov\.ru/document/\d+",
@@ -81,8 +127,49 @@ DOC_URL_PATTERNS = [
     r"https?://fstec\.ru/.*",
 ]
 
+DROP_URL_RE = re.compile("|".join(f"(?:{p})" for p in DROP_URL_PATTERNS), flags=re.IGNORECASE)
+DOC_URL_RE = re.compile("|".join(f"(?:{p})" for p in DOC_URL_PATTERNS), flags=re.IGNORECASE)
+
 PRAVO_DOC_RE = re.compile(r"https?://publication\.pravo\.gov\.ru/document/\d+")
 REGULATION_PROJECT_RE = re.compile(r"https?://regulation\.gov\.ru/projects/\d+")
+PRAVO_DOC_PREFIXES = (
+    "http://publication.pravo.gov.ru/document/",
+    "https://publication.pravo.gov.ru/document/",
+)
+REGULATION_PROJECT_PREFIXES = (
+    "http://regulation.gov.ru/projects/",
+    "https://regulation.gov.ru/projects/",
+)
+
+DOC_KIND_RE = re.compile(
+    r"(?P<pravo>publication\.pravo\.gov\.ru/document/)"
+    r"|(?P<regulation>regulation\.gov\.ru/projects/)"
+    r"|(?P<cbr>cbr\.ru)"
+    r"|(?P<fstec>fstec\.ru)",
+    flags=re.IGNORECASE,
+)
+DOC_KIND_PDF_TITLES = {
+    "cbr": "Документ Банка России",
+    "fstec": "Документ ФСТЭК",
+}
+
+WS_RE = re.compile(r"\s+")
+HREF_RE = re.compile(r'href\s*=\s*["\']([^"\']+)["\']', flags=re.IGNORECASE)
+ANCHOR_RE = re.compile(
+    r'<a\b[^>]*?href\s*=\s*["\']([^"\']+)["\'][^>]*>(.*?)</a>',
+    flags=re.IGNORECASE | re.DOTALL,
+)
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", flags=re.IGNORECASE | re.DOTALL)
+H1_RE = re.compile(r"<h1[^>]*>(.*?)</h1>", flags=re.IGNORECASE | re.DOTALL)
+HTML_SCRIPT_RE = re.compile(r"(?is)<script.*?>.*?</script>")
+HTML_STYLE_RE = re.compile(r"(?is)<style.*?>.*?</style>")
+HTML_HEAD_RE = re.compile(r"(?is)<head.*?>.*?</head>")
+HTML_TAG_RE = re.compile(r"(?is)<[^>]+>")
+HTML_MAIN_RE = re.compile(r"(?is)<(main|article)\b[^>]*>(.*)</\1>")
+
+AI_JSON_OBJECT_RE = re.compile(r"\{.*\}", flags=re.DOTALL)
+AI_JSON_ARRAY_RE = re.compile(r"\[.*\]", flags=re.DOTALL)
+TG_RETRY_AFTER_RE = re.compile(r"retry after (\d+)", flags=re.IGNORECASE)
 
 TEXT_DROP_PATTERNS = [
     r"служебн\w*\s+поведени\w*",
@@ -120,6 +207,9 @@ TEXT_KEEP_PATTERNS = [
     r"защит\w*\s+персональн\w*\s+данн\w*",
 ]
 
+TEXT_DROP_RE = re.compile("|".join(f"(?:{p})" for p in TEXT_DROP_PATTERNS), flags=re.IGNORECASE)
+TEXT_KEEP_RE = re.compile("|".join(f"(?:{p})" for p in TEXT_KEEP_PATTERNS), flags=re.IGNORECASE)
+
 PROJECTS_NPA_SCORE_RULES: List[Tuple[int, str]] = [
     (10, r"средств?\s+защит\w*\s+конфиденциальн\w*\s+информац\w*"),
     (10, r"защит\w*\s+конфиденциальн\w*\s+информац\w*"),
@@ -173,6 +263,137 @@ PROJECTS_NPA_SCORE_RULES: List[Tuple[int, str]] = [
     (-6, r"спорт"),
     (-6, r"культур"),
 ]
+PROJECTS_NPA_SCORE_RES: List[Tuple[int, re.Pattern]] = [
+    (weight, re.compile(pattern, flags=re.IGNORECASE))
+    for weight, pattern in PROJECTS_NPA_SCORE_RULES
+]
+
+
+AI_ANALYSIS_RULES = """
+1. relevance — релевантность именно для информационной безопасности
+2. impact — практическое влияние на организацию
+3. action — что делать с документом
+4. summary — кратко и строго по фактам
+5. why_it_matters — зачем это важно в 1 коротком предложении
+6. title — короткий понятный заголовок
+
+RELEVANCE:
+- высокая
+- средняя
+- низкая
+- неясно
+
+Высокая relevance только если документ прямо связан с:
+- защитой информации
+- информационной безопасностью
+- кибербезопасностью
+- КИИ
+- ПДн и их защитой
+- криптографией / СКЗИ
+- ОРИ
+- обязательными мерами ИБ / ИТ-контроля
+
+Низкая relevance для:
+- кадров
+- служебного поведения
+- конфликта интересов
+- соцгарантий
+- конкурсов
+- вступительных испытаний
+- внутренних оргвопросов
+- гражданской обороны без ИБ-компонента
+
+IMPACT:
+- высокое
+- среднее
+- низкое
+- неясно
+
+Высокое impact:
+- если документ явно устанавливает, меняет или усиливает обязательные требования, формы, контроль, отчетность, реестры, процедуры надзора или меры защиты, которые могут затронуть организации
+
+Среднее impact:
+- если тема профильная, но по доступному тексту не видно масштаба изменений
+
+Низкое impact:
+- если документ технический, внутренний, узкий или почти не влияет на внешние организации
+
+ACTION:
+- urgent -> если документ явно требует быстрого внимания
+- review -> если документ точно стоит изучить
+- monitor -> если документ потенциально полезен, но влияние пока неочевидно
+- ignore -> если документ не несет практической ценности для ИБ-мониторинга
+
+НЕ ДОДУМЫВАЙ.
+Если нет достаточного текста — честно ставь "неясно".
+""".strip()
+
+
+DOC_PREVIEW_CACHE: Dict[str, "asyncio.Future[Tuple[str, str, str]]"] = {}
+DOC_FETCH_HOST_LIMITERS: Dict[str, "AdaptiveLimiter"] = {}
+HOST_TOKEN_BUCKETS: Dict[str, "TokenBucket"] = {}
+
+
+class NonRetryableHTTPError(RuntimeError):
+    pass
+
+
+class RateLimitedHTTPError(RuntimeError):
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    def __init__(self, limit: int, min_limit: int = 1) -> None:
+        self.limit = limit
+        self.max_limit = limit
+        self.min_limit = min_limit
+        self.active = 0
+        self.successes = 0
+        self._cond = asyncio.Condition()
+
+    def decrease(self) -> None:
+        self.limit = max(self.min_limit, int(self.limit * LIMITER_DECREASE_FACTOR))
+        self.successes = 0
+
+    def increase(self) -> None:
+        self.successes += 1
+        if self.successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self.successes = 0
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        async with self._cond:
+            self.active -= 1
+            if exc is None:
+                self.increase()
+            self._cond.notify_all()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+        self.updated_at = time.monotonic()
 
 
 @dataclass(frozen=True)
@@ -189,38 +410,47 @@ def now_msk_str() -> str:
 
 
 def normalize_spaces(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return WS_RE.sub(" ", text).strip()
 
 
+@lru_cache(maxsize=URL_CLASSIFY_CACHE_SIZE)
 def is_drop_url(url: str) -> bool:
     u = url.strip()
+    lowered = u.lower()
 
-    for p in DROP_URL_PATTERNS:
-        if re.search(p, u, flags=re.IGNORECASE):
-            return True
-
-    path = urlparse(u).path.lower()
-    for ext in DROP_EXTENSIONS:
-        if path.endswith(ext):
-            return True
+    if lowered.startswith(DROP_URL_PREFIXES):
+        return True
+    if any(needle in lowered for needle in DROP_URL_SUBSTRINGS):
+        return True
+    if DROP_URL_RE.search(u):
+        return True
 
-    return False
+    return urlparse(lowered).path.endswith(DROP_EXTENSIONS)
 
 
 def normalize_url(url: str) -> str:
     return url.strip().replace(" ", "")
 
 
+@lru_cache(maxsize=URL_CLASSIFY_CACHE_SIZE)
+def url_host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
 def load_json_file(path: str, default: Any) -> Any:
     if not os.path.exists(path):
         return default
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def save_json_file(path: str, data: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
 
 def load_sources() -> List[Dict[str, Any]]:
@@ -236,46 +466,205 @@ def load_sources() -> List[Dict[str, Any]]:
     return data
 
 
-async def fetch_text(session: aiohttp.ClientSession, url: str) -> str:
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(
+    attempt: int,
+    started_at: float,
+    deadline: Optional[float],
+    retry_after: Optional[float] = None,
+) -> Optional[float]:
+    if retry_after is not None:
+        delay = retry_after + random.uniform(0, 0.4)
+    else:
+        delay = (HTTP_RETRY_BACKOFF ** (attempt - 1)) * random.uniform(0.5, 1.5)
+    if deadline is not None and time.monotonic() - started_at + delay > deadline:
+        return None
+    return delay
+
+
+async def with_retries(
+    request: Callable[[], Awaitable[T]],
+    retries: int = HTTP_RETRIES,
+    deadline: Optional[float] = HTTP_RETRY_DEADLINE_SECONDS,
+    retry_after_max: Optional[float] = HTTP_RETRY_AFTER_MAX_SECONDS,
+) -> T:
     last_err = None
-    for attempt in range(1, HTTP_RETRIES + 1):
+    started_at = time.monotonic()
+    for attempt in range(1, retries + 1):
         try:
-            async with session.get(url, allow_redirects=True) as r:
-                if r.status == 429 or 500 <= r.status <= 599:
-                    txt = await r.text(errors="ignore")
-                    raise RuntimeError(f"HTTP {r.status}: {txt[:300]}")
-                if r.status >= 400:
-                    txt = await r.text(errors="ignore")
-                    raise RuntimeError(f"HTTP {r.status}: {txt[:300]}")
-                return await r.text(errors="ignore")
+            return await request()
+        except NonRetryableHTTPError:
+            raise
         except Exception as e:
             last_err = e
-            if attempt < HTTP_RETRIES:
-                await asyncio.sleep((HTTP_RETRY_BACKOFF ** (attempt - 1)) + 0.2)
-            else:
+            retry_after = e.retry_after if isinstance(e, RateLimitedHTTPError) else None
+            if retry_after is not None and retry_after_max is not None:
+                retry_after = min(retry_after, retry_after_max)
+            delay = (
+                retry_delay(attempt, started_at, deadline, retry_after)
+                if attempt < retries
+                else None
+            )
+            if delay is None:
                 raise
+            await asyncio.sleep(delay)
     raise RuntimeError(str(last_err))
 
 
-async def fetch_bytes(session: aiohttp.ClientSession, url: str) -> bytes:
-    last_err = None
-    for attempt in range(1, HTTP_RETRIES + 1):
-        try:
+def host_token_bucket(url: str) -> Optional[TokenBucket]:
+    host = url_host(url).removeprefix("www.")
+    rate = HOST_RATE_LIMITS.get(host)
+    if rate is None:
+        return None
+
+    bucket = HOST_TOKEN_BUCKETS.get(host)
+    if bucket is None:
+        bucket = TokenBucket(*rate)
+        HOST_TOKEN_BUCKETS[host] = bucket
+    return bucket
+
+
+async def pace_host(url: str) -> None:
+    bucket = host_token_bucket(url)
+    if bucket is not None:
+        await bucket.acquire()
+
+
+@asynccontextmanager
+async def host_slot(url: str, limiters: Sequence[AdaptiveLimiter] = ()) -> AsyncIterator[None]:
+    await pace_host(url)
+    async with AsyncExitStack() as stack:
+        for limiter in limiters:
+            await stack.enter_async_context(limiter)
+        yield
+
+
+async def read_error_snippet(r: aiohttp.ClientResponse, limit: int = 300) -> str:
+    buf = bytearray()
+    async for chunk in r.content.iter_chunked(4096):
+        buf.extend(chunk)
+        if len(buf) >= limit:
+            break
+    return bytes(buf[:limit]).decode(r.charset or "utf-8", errors="ignore")
+
+
+async def raise_for_http_status(
+    r: aiohttp.ClientResponse,
+    snippet_limit: int = 300,
+    limiters: Sequence[AdaptiveLimiter] = (),
+) -> None:
+    if r.status == 429:
+        for limiter in limiters:
+            limiter.decrease()
+        txt = await read_error_snippet(r, limit=snippet_limit)
+        raise RateLimitedHTTPError(
+            f"HTTP {r.status}: {txt}",
+            parse_retry_after(r.headers.get("Retry-After")),
+        )
+    if r.status in HTTP_RETRYABLE_STATUSES or 500 <= r.status <= 599:
+        txt = await read_error_snippet(r, limit=snippet_limit)
+        raise RuntimeError(f"HTTP {r.status}: {txt}")
+    if r.status >= 400:
+        txt = await read_error_snippet(r, limit=snippet_limit)
+        raise NonRetryableHTTPError(f"HTTP {r.status}: {txt}")
+
+
+def parse_json_body(body: str) -> Dict[str, Any]:
+    try:
+        return orjson.loads(body)
+    except Exception as e:
+        raise RuntimeError(
+            f"Некорректный JSON: {type(e).__name__}: {e}; body={body[:300]}"
+        )
+
+
+async def read_text_capped(
+    r: aiohttp.ClientResponse,
+    max_bytes: int,
+    stop_marker: Optional[bytes] = None,
+) -> str:
+    buf = bytearray()
+    async for chunk in r.content.iter_chunked(65536):
+        tail_start = max(0, len(buf) - len(stop_marker)) if stop_marker else 0
+        buf.extend(chunk)
+        if len(buf) >= max_bytes:
+            break
+        if stop_marker and stop_marker in bytes(buf[tail_start:]).lower():
+            break
+    return bytes(buf[:max_bytes]).decode(r.charset or "utf-8", errors="ignore")
+
+
+async def fetch_text(
+    session: aiohttp.ClientSession,
+    url: str,
+    max_bytes: int = HTML_MAX_BYTES,
+    stop_marker: Optional[bytes] = None,
+    limiters: Sequence[AdaptiveLimiter] = (),
+) -> str:
+    async def request() -> str:
+        async with host_slot(url, limiters):
+            async with session.get(url, allow_redirects=True) as r:
+                await raise_for_http_status(r, limiters=limiters)
+                return await read_text_capped(r, max_bytes, stop_marker)
+
+    return await with_retries(request)
+
+
+async def fetch_text_conditional(
+    session: aiohttp.ClientSession,
+    url: str,
+    validators: Dict[str, Any],
+    max_bytes: int = HTML_MAX_BYTES,
+    limiters: Sequence[AdaptiveLimiter] = (),
+) -> Tuple[Optional[str], Dict[str, str]]:
+    headers: Dict[str, str] = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = str(validators["etag"])
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = str(validators["last_modified"])
+
+    async def request() -> Tuple[Optional[str], Dict[str, str]]:
+        async with host_slot(url, limiters):
+            async with session.get(url, headers=headers, allow_redirects=True) as r:
+                if r.status == 304:
+                    return None, {}
+                await raise_for_http_status(r, limiters=limiters)
+                new_validators: Dict[str, str] = {}
+                if r.headers.get("ETag"):
+                    new_validators["etag"] = r.headers["ETag"]
+                if r.headers.get("Last-Modified"):
+                    new_validators["last_modified"] = r.headers["Last-Modified"]
+                return await read_text_capped(r, max_bytes), new_validators
+
+    return await with_retries(request)
+
+
+async def fetch_bytes(
+    session: aiohttp.ClientSession,
+    url: str,
+    limiters: Sequence[AdaptiveLimiter] = (),
+) -> bytes:
+    async def request() -> bytes:
+        async with host_slot(url, limiters):
             async with session.get(url, allow_redirects=True) as r:
-                if r.status == 429 or 500 <= r.status <= 599:
-                    body = await r.read()
-                    raise RuntimeError(f"HTTP {r.status}: {body[:200]}")
-                if r.status >= 400:
-                    body = await r.read()
-                    raise RuntimeError(f"HTTP {r.status}: {body[:200]}")
+                await raise_for_http_status(r, snippet_limit=200, limiters=limiters)
                 return await r.read()
-        except Exception as e:
-            last_err = e
-            if attempt < HTTP_RETRIES:
-                await asyncio.sleep((HTTP_RETRY_BACKOFF ** (attempt - 1)) + 0.2)
-            else:
-                raise
-    raise RuntimeError(str(last_err))
+
+    return await with_retries(request)
 
 
 async def fetch_json_post(
@@ -283,8 +672,8 @@ async def fetch_json_post(
     url: str,
     payload: Dict[str, Any],
     headers: Optional[Dict[str, str]] = None,
+    limiters: Sequence[AdaptiveLimiter] = (),
 ) -> Dict[str, Any]:
-    last_err = None
     merged_headers = {
         "User-Agent": USER_AGENT,
         "Accept": "application/json, text/plain, */*",
@@ -295,35 +684,23 @@ async def fetch_json_post(
     if headers:
         merged_headers.update(headers)
 
-    for attempt in range(1, HTTP_RETRIES + 1):
-        try:
-            async with session.post(url, json=payload, headers=merged_headers) as r:
-                body = await r.text(errors="ignore")
-                if r.status == 429 or 500 <= r.status <= 599:
-                    raise RuntimeError(f"HTTP {r.status}: {body[:300]}")
-                if r.status >= 400:
-                    raise RuntimeError(f"HTTP {r.status}: {body[:300]}")
-                try:
-                    return json.loads(body)
-                except Exception as e:
-                    raise RuntimeError(
-                        f"Некорректный JSON: {type(e).__name__}: {e}; body={body[:300]}"
-                    )
-        except Exception as e:
-            last_err = e
-            if attempt < HTTP_RETRIES:
-                await asyncio.sleep((HTTP_RETRY_BACKOFF ** (attempt - 1)) + 0.2)
-            else:
-                raise
-    raise RuntimeError(str(last_err))
+    payload_bytes = orjson.dumps(payload)
+
+    async def request() -> Dict[str, Any]:
+        async with host_slot(url, limiters):
+            async with session.post(url, data=payload_bytes, headers=merged_headers) as r:
+                await raise_for_http_status(r, limiters=limiters)
+                return parse_json_body(await r.text(errors="ignore"))
+
+    return await with_retries(request)
 
 
 async def fetch_json_get(
     session: aiohttp.ClientSession,
     url: str,
     headers: Optional[Dict[str, str]] = None,
+    limiters: Sequence[AdaptiveLimiter] = (),
 ) -> Dict[str, Any]:
-    last_err = None
     merged_headers = {
         "User-Agent": USER_AGENT,
         "Accept": "application/json, text/plain, */*",
@@ -332,67 +709,80 @@ async def fetch_json_get(
     if headers:
         merged_headers.update(headers)
 
-    for attempt in range(1, HTTP_RETRIES + 1):
-        try:
+    async def request() -> Dict[str, Any]:
+        async with host_slot(url, limiters):
             async with session.get(url, headers=merged_headers, allow_redirects=True) as r:
-                body = await r.text(errors="ignore")
-                if r.status == 429 or 500 <= r.status <= 599:
-                    raise RuntimeError(f"HTTP {r.status}: {body[:300]}")
-                if r.status >= 400:
-                    raise RuntimeError(f"HTTP {r.status}: {body[:300]}")
-                try:
-                    return json.loads(body)
-                except Exception as e:
-                    raise RuntimeError(
-                        f"Некорректный JSON: {type(e).__name__}: {e}; body={body[:300]}"
-                    )
-        except Exception as e:
-            last_err = e
-            if attempt < HTTP_RETRIES:
-                await asyncio.sleep((HTTP_RETRY_BACKOFF ** (attempt - 1)) + 0.2)
-            else:
-                raise
-    raise RuntimeError(str(last_err))
+                await raise_for_http_status(r, limiters=limiters)
+                return parse_json_body(await r.text(errors="ignore"))
 
+    return await with_retries(request)
 
-def extract_links_from_html(base_url: str, page_html: str) -> List[str]:
-    links = []
-    for m in re.finditer(r'href\s*=\s*["\']([^"\']+)["\']', page_html, flags=re.IGNORECASE):
-        href = m.group(1).strip()
-        if not href:
-            continue
-        abs_url = urljoin(base_url, href)
-        links.append(abs_url)
-    return links
+
+def make_url_resolver(base_url: str) -> Callable[[str], str]:
+    parts = urlsplit(base_url)
+    root = f"{parts.scheme}://{parts.netloc}"
+
+    def resolve(href: str) -> str:
+        if href.startswith(("http://", "https://")):
+            return href
+        if "/." not in href:
+            if href.startswith("//"):
+                return f"{parts.scheme}:{href}"
+            if href.startswith("/"):
+                return root + href
+        return urljoin(base_url, href)
+
+    return resolve
 
 
-def pick_document_links(urls: List[str]) -> List[str]:
+def extract_anchor_titles(base_url: str, page_html: str, urls: List[str]) -> Dict[str, str]:
+    resolve = make_url_resolver(base_url)
+    wanted = set(urls)
+    titles: Dict[str, str] = {}
+    for m in ANCHOR_RE.finditer(page_html):
+        u = normalize_url(resolve(m.group(1).strip()))
+        if u not in wanted or u in titles:
+            continue
+        text = normalize_spaces(HTML_TAG_RE.sub(" ", m.group(2)))
+        if len(text) >= MIN_ANCHOR_TITLE_CHARS:
+            titles[u] = clean_title(text)
+    return titles
+
+
+@lru_cache(maxsize=URL_CLASSIFY_CACHE_SIZE)
+def is_document_url(url: str) -> bool:
+    if "regulation.gov.ru" in url:
+        return url.startswith(REGULATION_PROJECT_PREFIXES) and bool(REGULATION_PROJECT_RE.match(url))
+    if "publication.pravo.gov.ru" in url:
+        return url.startswith(PRAVO_DOC_PREFIXES) and bool(PRAVO_DOC_RE.match(url))
+    return bool(DOC_URL_RE.search(url))
+
+
+def extract_document_links(
+    base_url: str,
+    page_html: str,
+    limit: int = MAX_DOC_LINKS_PER_SOURCE,
+) -> List[str]:
+    resolve = make_url_resolver(base_url)
     out: List[str] = []
     seen = set()
 
-    for u in urls:
-        u = normalize_url(u)
+    for m in HREF_RE.finditer(page_html):
+        href = m.group(1).strip()
+        if not href:
+            continue
+
+        u = normalize_url(resolve(href))
         if not u or u in seen:
             continue
         seen.add(u)
 
-        if is_drop_url(u):
+        if is_drop_url(u) or not is_document_url(u):
             continue
 
-        ok = False
-        for p in DOC_URL_PATTERNS:
-            if re.search(p, u, flags=re.IGNORECASE):
-                ok = True
-                break
-
-        if "publication.pravo.gov.ru" in u:
-            ok = bool(PRAVO_DOC_RE.search(u))
-
-        if "regulation.gov.ru" in u:
-            ok = bool(REGULATION_PROJECT_RE.search(u))
-
-        if ok:
-            out.append(u)
+        out.append(u)
+        if len(out) >= limit:
+            break
 
     return out
 
@@ -406,11 +796,25 @@ def clean_title(raw_title: str) -> str:
     return title[:240] if title else "Документ"
 
 
+def extract_title_from_html(page_html: str) -> str:
+    for rx in (TITLE_RE, H1_RE):
+        m = rx.search(page_html)
+        if not m:
+            continue
+        title = normalize_spaces(HTML_TAG_RE.sub(" ", m.group(1)))
+        if title:
+            return clean_title(title)
+    return "Документ"
+
+
 def extract_text_preview_from_html(page_html: str) -> str:
-    page_html = re.sub(r"(?is)<script.*?>.*?</script>", " ", page_html)
-    page_html = re.sub(r"(?is)<style.*?>.*?</style>", " ", page_html)
-    page_html = re.sub(r"(?is)<head.*?>.*?</head>", " ", page_html)
-    page_html = re.sub(r"(?is)<[^>]+>", " ", page_html)
+    m = HTML_MAIN_RE.search(page_html)
+    if m and HTML_TAG_RE.sub(" ", m.group(2)).strip():
+        page_html = m.group(2)
+    page_html = HTML_SCRIPT_RE.sub(" ", page_html)
+    page_html = HTML_STYLE_RE.sub(" ", page_html)
+    page_html = HTML_HEAD_RE.sub(" ", page_html)
+    page_html = HTML_TAG_RE.sub(" ", page_html)
     page_html = html_lib.unescape(page_html)
     page_html = normalize_spaces(page_html)
     return page_html[:5000]
@@ -446,16 +850,12 @@ def combined_item_text(item: Item) -> str:
     return normalize_spaces(f"{item.title} {item.content_preview}".lower())
 
 
-def text_matches_any(text: str, patterns: List[str]) -> bool:
-    return any(re.search(p, text, flags=re.IGNORECASE) for p in patterns)
-
-
 def projects_npa_score(item: Item) -> int:
     text = combined_item_text(item)
     score = 0
 
-    for weight, pattern in PROJECTS_NPA_SCORE_RULES:
-        if re.search(pattern, text, flags=re.IGNORECASE):
+    for weight, pattern in PROJECTS_NPA_SCORE_RES:
+        if pattern.search(text):
             score += weight
 
     if "фсб" in text:
@@ -475,7 +875,7 @@ def projects_npa_score(item: Item) -> int:
 def prefilter_item(item: Item, regulator: str) -> bool:
     text = combined_item_text(item)
 
-    if text_matches_any(text, TEXT_DROP_PATTERNS):
+    if TEXT_DROP_RE.search(text):
         return False
 
     if regulator == "Проекты НПА":
@@ -484,29 +884,48 @@ def prefilter_item(item: Item, regulator: str) -> bool:
     if regulator in {"ФСТЭК", "ФСБ", "Минцифры", "Роскомнадзор", "Банк России"}:
         return True
 
-    return text_matches_any(text, TEXT_KEEP_PATTERNS)
+    return bool(TEXT_KEEP_RE.search(text))
 
 
-async def title_and_preview_for_doc(session: aiohttp.ClientSession, url: str) -> Tuple[str, str, str]:
+async def fetch_title_and_preview(session: aiohttp.ClientSession, url: str) -> Tuple[str, str, str]:
+    host = url_host(url)
+    host_limiter = DOC_FETCH_HOST_LIMITERS.get(host)
+    if host_limiter is None:
+        host_limiter = AdaptiveLimiter(DOC_FETCH_MAX_CONCURRENT_PER_HOST)
+        DOC_FETCH_HOST_LIMITERS[host] = host_limiter
+
     try:
         if url.lower().endswith(".pdf"):
-            pdf_bytes = await fetch_bytes(session, url)
+            pdf_bytes = await fetch_bytes(session, url, limiters=(host_limiter,))
             preview = extract_pdf_text_from_bytes(pdf_bytes)
             return "PDF документ", preview, "pdf"
 
-        page_html = await fetch_text(session, url)
-
-        title = "Документ"
-        m = re.search(r"<title>(.*?)</title>", page_html, flags=re.IGNORECASE | re.DOTALL)
-        if m:
-            title = clean_title(m.group(1))
+        page_html = await fetch_text(
+            session,
+            url,
+            stop_marker=DOC_HTML_STOP_MARKER,
+            limiters=(host_limiter,),
+        )
 
+        title = extract_title_from_html(page_html)
         preview = extract_text_preview_from_html(page_html)
         return title, preview, "html"
     except Exception:
         return "Документ", "", "unknown"
 
 
+async def title_and_preview_for_doc(session: aiohttp.ClientSession, url: str) -> Tuple[str, str, str]:
+    task = DOC_PREVIEW_CACHE.get(url)
+    if task is None:
+        task = asyncio.ensure_future(fetch_title_and_preview(session, url))
+        DOC_PREVIEW_CACHE[url] = task
+
+    result = await asyncio.shield(task)
+    if result[2] == "unknown":
+        DOC_PREVIEW_CACHE.pop(url, None)
+    return result
+
+
 def parse_regulation_result_list(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     if isinstance(data.get("result"), list):
         return data.get("result", [])
@@ -526,11 +945,12 @@ def parse_regulation_result_list(data: Dict[str, Any]) -> List[Dict[str, Any]]:
 async def fetch_regulation_stage_info(
     session: aiohttp.ClientSession,
     project_id: str,
+    limiters: Sequence[AdaptiveLimiter] = (),
 ) -> Tuple[str, str]:
     stage_url = f"https://regulation.gov.ru/api/public/PublicProjects/GetProjectStages/{project_id}"
 
     try:
-        data = await fetch_json_get(session, stage_url)
+        data = await fetch_json_get(session, stage_url, limiters=limiters)
     except Exception:
         return "", ""
 
@@ -596,11 +1016,109 @@ async def fetch_regulation_stage_info(
 async def collect_regulation_projects(
     session: aiohttp.ClientSession,
     max_pages: int = 5,
+    limiters: Sequence[AdaptiveLimiter] = (),
 ) -> Tuple[List[Item], Optional[str]]:
     api_url = "https://regulation.gov.ru/api/public/PublicProjects/GetFiltered"
 
     items: List[Item] = []
     seen_keys: set[str] = set()
+    stage_limiter = AdaptiveLimiter(DOC_FETCH_MAX_CONCURRENT_PER_HOST)
+
+    async def build_item(raw: Any) -> Optional[Item]:
+        if not isinstance(raw, dict):
+            return None
+
+        project_id = str(
+            raw.get("projectId")
+            or raw.get("id")
+            or raw.get("Id")
+            or ""
+        ).strip()
+
+        if not project_id:
+            return None
+
+        title = clean_title(str(
+            raw.get("title")
+            or raw.get("name")
+            or raw.get("projectName")
+            or "Проект НПА"
+        ))
+
+        department = normalize_spaces(str(
+            raw.get("developedDepartment")
+            or raw.get("developer")
+            or raw.get("department")
+            or ""
+        ))
+
+        project_type = normalize_spaces(str(
+            raw.get("projectType")
+            or raw.get("type")
+            or ""
+        ))
+
+        procedure = normalize_spaces(str(
+            raw.get("procedure")
+            or raw.get("procedureName")
+            or ""
+        ))
+
+        publication_date = normalize_spaces(str(
+            raw.get("publicationDate")
+            or raw.get("createDate")
+            or raw.get("creationDate")
+            or raw.get("date")
+            or ""
+        ))
+
+        stage = normalize_spaces(str(
+            raw.get("stage")
+            or raw.get("stageName")
+            or ""
+        ))
+
+        status = normalize_spaces(str(
+            raw.get("status")
+            or raw.get("statusName")
+            or ""
+        ))
+
+        if not stage or not status:
+            stage_api, status_api = await fetch_regulation_stage_info(
+                session,
+                project_id,
+                (stage_limiter,),
+            )
+            if stage_api:
+                stage = stage_api
+            if status_api:
+                status = status_api
+
+        url = f"https://regulation.gov.ru/projects/{project_id}"
+
+        dedupe_key = normalize_spaces(
+            f"{project_id}|{stage}|{status}|{publication_date}"
+        )
+
+        preview_parts = [
+            title,
+            f"Разработчик: {department}" if department else "",
+            f"Тип: {project_type}" if project_type else "",
+            f"Процедура: {procedure}" if procedure else "",
+            f"Стадия: {stage}" if stage else "",
+            f"Статус: {status}" if status else "",
+            f"Дата: {publication_date}" if publication_date else "",
+        ]
+        preview = normalize_spaces(" ".join(p for p in preview_parts if p))
+
+        return Item(
+            title=title,
+            url=url,
+            content_preview=preview[:5000],
+            source_type="regulation_api",
+            dedupe_key=dedupe_key,
+        )
 
     for page in range(1, max_pages + 1):
         payload = {
@@ -625,7 +1143,7 @@ async def collect_regulation_projects(
         }
 
         try:
-            data = await fetch_json_post(session, api_url, payload)
+            data = await fetch_json_post(session, api_url, payload, limiters=limiters)
         except asyncio.TimeoutError:
             return [], "Источник не ответил вовремя"
         except Exception as e:
@@ -635,103 +1153,12 @@ async def collect_regulation_projects(
         if not result:
             break
 
-        for raw in result:
-            if not isinstance(raw, dict):
-                continue
-
-            project_id = str(
-                raw.get("projectId")
-                or raw.get("id")
-                or raw.get("Id")
-                or ""
-            ).strip()
-
-            if not project_id:
+        built = await asyncio.gather(*(build_item(raw) for raw in result))
+        for item in built:
+            if item is None or item.dedupe_key in seen_keys:
                 continue
-
-            title = clean_title(str(
-                raw.get("title")
-                or raw.get("name")
-                or raw.get("projectName")
-                or "Проект НПА"
-            ))
-
-            department = normalize_spaces(str(
-                raw.get("developedDepartment")
-                or raw.get("developer")
-                or raw.get("department")
-                or ""
-            ))
-
-            project_type = normalize_spaces(str(
-                raw.get("projectType")
-                or raw.get("type")
-                or ""
-            ))
-
-            procedure = normalize_spaces(str(
-                raw.get("procedure")
-                or raw.get("procedureName")
-                or ""
-            ))
-
-            publication_date = normalize_spaces(str(
-                raw.get("publicationDate")
-                or raw.get("createDate")
-                or raw.get("creationDate")
-                or raw.get("date")
-                or ""
-            ))
-
-            stage = normalize_spaces(str(
-                raw.get("stage")
-                or raw.get("stageName")
-                or ""
-            ))
-
-            status = normalize_spaces(str(
-                raw.get("status")
-                or raw.get("statusName")
-                or ""
-            ))
-
-            if not stage or not status:
-                stage_api, status_api = await fetch_regulation_stage_info(session, project_id)
-                if stage_api:
-                    stage = stage_api
-                if status_api:
-                    status = status_api
-
-            url = f"https://regulation.gov.ru/projects/{project_id}"
-
-            dedupe_key = normalize_spaces(
-                f"{project_id}|{stage}|{status}|{publication_date}"
-            )
-
-            if dedupe_key in seen_keys:
-                continue
-            seen_keys.add(dedupe_key)
-
-            preview_parts = [
-                title,
-                f"Разработчик: {department}" if department else "",
-                f"Тип: {project_type}" if project_type else "",
-                f"Процедура: {procedure}" if procedure else "",
-                f"Стадия: {stage}" if stage else "",
-                f"Статус: {status}" if status else "",
-                f"Дата: {publication_date}" if publication_date else "",
-            ]
-            preview = normalize_spaces(" ".join(p for p in preview_parts if p))
-
-            items.append(
-                Item(
-                    title=title,
-                    url=url,
-                    content_preview=preview[:5000],
-                    source_type="regulation_api",
-                    dedupe_key=dedupe_key,
-                )
-            )
+            seen_keys.add(item.dedupe_key)
+            items.append(item)
 
     items.sort(key=projects_npa_score, reverse=True)
     return items, None
@@ -741,51 +1168,65 @@ async def collect_items_for_source(
     session: aiohttp.ClientSession,
     regulator: str,
     url: str,
+    seen_keys: Optional[Dict[str, int]] = None,
+    http_cache: Optional[Dict[str, Any]] = None,
+    limiters: Sequence[AdaptiveLimiter] = (),
 ) -> Tuple[List[Item], Optional[str]]:
+    seen_keys = seen_keys or {}
+    http_cache = http_cache if http_cache is not None else {}
+
     if regulator == "Проекты НПА":
-        return await collect_regulation_projects(session, max_pages=5)
+        return await collect_regulation_projects(session, max_pages=5, limiters=limiters)
 
     try:
-        page_html = await fetch_text(session, url)
-        links = extract_links_from_html(url, page_html)
-        doc_links = pick_document_links(links)
-        doc_links = doc_links[:MAX_DOC_LINKS_PER_SOURCE]
+        cached = http_cache.get(url) or {}
+        page_html, validators = await fetch_text_conditional(
+            session,
+            url,
+            cached,
+            limiters=limiters,
+        )
+        if page_html is None:
+            doc_links = [str(u) for u in cached.get("links", [])]
+            anchor_titles = dict(cached.get("titles", {}))
+        else:
+            doc_links = extract_document_links(url, page_html)
+            anchor_titles = extract_anchor_titles(url, page_html, doc_links)
+            if validators:
+                http_cache[url] = {**validators, "links": doc_links, "titles": anchor_titles}
+            else:
+                http_cache.pop(url, None)
 
-        items: List[Item] = []
-        for link in doc_links:
+        async def build_item(link: str) -> Item:
             title = "Документ"
             preview = ""
             source_type = "html"
 
-            if "publication.pravo.gov.ru/document/" in link:
-                title, preview, source_type = await title_and_preview_for_doc(session, link)
-            elif "regulation.gov.ru/projects/" in link:
-                title = "Проект НПА"
-            elif "cbr.ru" in link:
-                title, preview, source_type = await title_and_preview_for_doc(session, link)
-                if title == "PDF документ":
-                    title = "Документ Банка России"
-            elif "fstec.ru" in link:
+            m = DOC_KIND_RE.search(link)
+            kind = m.lastgroup if m else None
+
+            anchor_title = anchor_titles.get(link, "")
+
+            if kind == "regulation":
+                title = anchor_title or "Проект НПА"
+            elif kind is not None:
                 title, preview, source_type = await title_and_preview_for_doc(session, link)
-                if title == "PDF документ":
-                    title = "Документ ФСТЭК"
-
-            items.append(
-                Item(
-                    title=title,
-                    url=link,
-                    content_preview=preview,
-                    source_type=source_type,
-                    dedupe_key=None,
-                )
+                if title in {"Документ", "PDF документ"} and anchor_title:
+                    title = anchor_title
+                elif title == "PDF документ" and kind in DOC_KIND_PDF_TITLES:
+                    title = DOC_KIND_PDF_TITLES[kind]
+
+            return Item(
+                title=title,
+                url=link,
+                content_preview=preview,
+                source_type=source_type,
+                dedupe_key=None,
             )
 
-        uniq: Dict[str, Item] = {}
-        for it in items:
-            if it.url not in uniq:
-                uniq[it.url] = it
-
-        return list(uniq.values()), None
+        to_fetch = [link for link in doc_links if link not in seen_keys]
+        items = await asyncio.gather(*(build_item(link) for link in to_fetch))
+        return list(items), None
 
     except asyncio.TimeoutError:
         return [], "Источник не ответил вовремя"
@@ -793,6 +1234,69 @@ async def collect_items_for_source(
         return [], f"{type(e).__name__}: {e}"
 
 
+async def collect_all_sources(
+    session: aiohttp.ClientSession,
+    regulator_to_urls: Dict[str, List[str]],
+    state: Dict[str, Any],
+    http_cache: Dict[str, Any],
+) -> Dict[str, Tuple[List[Item], List[Tuple[str, str]]]]:
+    limiter = AdaptiveLimiter(SOURCES_MAX_CONCURRENT)
+
+    jobs: List[Tuple[str, str]] = []
+    for regulator, urls in regulator_to_urls.items():
+        for u in urls:
+            jobs.append((regulator, u))
+            if regulator == "Проекты НПА":
+                break
+
+    host_limiters: Dict[str, AdaptiveLimiter] = {
+        url_host(u): AdaptiveLimiter(SOURCES_MAX_CONCURRENT_PER_HOST)
+        for _, u in jobs
+    }
+
+    async def collect_one(regulator: str, url: str) -> Tuple[List[Item], Optional[str]]:
+        return await collect_items_for_source(
+            session,
+            regulator,
+            url,
+            state["seen"].get(regulator),
+            http_cache,
+            (limiter, host_limiters[url_host(url)]),
+        )
+
+    results = await asyncio.gather(
+        *(collect_one(regulator, u) for regulator, u in jobs),
+        return_exceptions=True,
+    )
+
+    collected: Dict[str, Tuple[List[Item], List[Tuple[str, str]]]] = {
+        regulator: ([], []) for regulator in regulator_to_urls
+    }
+    collected_keys: Dict[str, set[str]] = {regulator: set() for regulator in regulator_to_urls}
+
+    for (regulator, u), result in zip(jobs, results):
+        all_items, errors = collected[regulator]
+        if isinstance(result, Exception):
+            errors.append((u, f"{type(result).__name__}: {result}"))
+            continue
+        items, err = result
+        if err:
+            errors.append((u, err))
+            continue
+
+        keys = collected_keys[regulator]
+        for it in items:
+            if regulator != "Проекты НПА" and is_drop_url(it.url):
+                continue
+            key = item_seen_key(it)
+            if key in keys:
+                continue
+            keys.add(key)
+            all_items.append(it)
+
+    return collected
+
+
 def load_state() -> Dict[str, Any]:
     st = load_json_file(STATE_FILE, {})
     if not isinstance(st, dict):
@@ -804,13 +1308,15 @@ def load_state() -> Dict[str, Any]:
     return st
 
 
-def item_seen_key(item: Item) -> str:
-    return item.dedupe_key or item.url
+def load_http_cache() -> Dict[str, Any]:
+    cache = load_json_file(HTTP_CACHE_FILE, {})
+    if not isinstance(cache, dict):
+        cache = {}
+    return cache
 
 
-def has_seen(state: Dict[str, Any], regulator: str, item: Item) -> bool:
-    seen = state["seen"].setdefault(regulator, {})
-    return item_seen_key(item) in seen
+def item_seen_key(item: Item) -> str:
+    return item.dedupe_key or item.url
 
 
 def mark_seen_many(state: Dict[str, Any], regulator: str, items: List[Item]) -> None:
@@ -820,7 +1326,11 @@ def mark_seen_many(state: Dict[str, Any], regulator: str, items: List[Item]) ->
         seen[item_seen_key(item)] = now_ts
 
 
-def compact_seen(state: Dict[str, Any], keep_days: int = 45) -> None:
+def compact_seen(
+    state: Dict[str, Any],
+    keep_days: int = 45,
+    max_per_regulator: int = SEEN_MAX_PER_REGULATOR,
+) -> None:
     cutoff = int(time.time()) - keep_days * 86400
     seen = state.get("seen", {})
     for reg in list(seen.keys()):
@@ -833,6 +1343,10 @@ def compact_seen(state: Dict[str, Any], keep_days: int = 45) -> None:
             if not isinstance(ts, int) or ts < cutoff:
                 reg_map.pop(key, None)
 
+        if len(reg_map) > max_per_regulator:
+            newest = sorted(reg_map.items(), key=lambda kv: kv[1], reverse=True)
+            seen[reg] = dict(newest[:max_per_regulator])
+
 
 def should_send_error(state: Dict[str, Any], regulator: str, cooldown_hours: int = 12) -> bool:
     now_ts = int(time.time())
@@ -844,96 +1358,80 @@ def should_send_error(state: Dict[str, Any], regulator: str, cooldown_hours: int
     return False
 
 
-async def analyze_with_openai(
-    client: AsyncOpenAI,
-    regulator: str,
-    item: Item,
-    sem: asyncio.Semaphore,
-) -> Dict[str, str]:
-    fallback = {
+def ai_fallback(item: Item, debug: str = "неизвестная ошибка") -> Dict[str, str]:
+    return {
         "relevance": "ошибка AI",
         "impact": "неясно",
         "action": "monitor",
         "summary": "AI-анализ не выполнен",
         "why_it_matters": "Не удалось получить оценку влияния документа.",
         "title": item.title,
-        "ai_debug": "неизвестная ошибка",
+        "ai_debug": debug,
     }
 
-    if not OPENAI_API_KEY:
-        fallback["ai_debug"] = "OPENAI_API_KEY не задан"
-        return fallback
-
-    preview = item.content_preview[:2500] if item.content_preview else ""
 
-    prompt = f"""
-Ты анализируешь нормативную публикацию для Telegram-бота мониторинга НПА.
-
-Нужно вернуть 6 полей:
-1. relevance — релевантность именно для информационной безопасности
-2. impact — практическое влияние на организацию
-3. action — что делать с документом
-4. summary — кратко и строго по фактам
-5. why_it_matters — зачем это важно в 1 коротком предложении
-6. title — короткий понятный заголовок
-
-RELEVANCE:
-- высокая
-- средняя
-- низкая
-- неясно
-
-Высокая relevance только если документ прямо связан с:
-- защитой информации
-- информационной безопасностью
-- кибербезопасностью
-- КИИ
-- ПДн и их защитой
-- криптографией / СКЗИ
-- ОРИ
-- обязательными мерами ИБ / ИТ-контроля
+def normalize_ai_result(data: Dict[str, Any], item: Item) -> Dict[str, str]:
+    title = clean_title(str(data.get("title", item.title)).strip()) or item.title
+    relevance = str(data.get("relevance", "неясно")).strip().lower()
+    impact = str(data.get("impact", "неясно")).strip().lower()
+    action = str(data.get("action", "monitor")).strip().lower()
+    summary = normalize_spaces(str(data.get("summary", "Описание не получено")).strip())
+    why_it_matters = normalize_spaces(
+        str(data.get("why_it_matters", "Практическая значимость не определена.")).strip()
+    )
+
+    if relevance not in {"высокая", "средняя", "низкая", "неясно"}:
+        relevance = "неясно"
+
+    if impact not in {"высокое", "среднее", "низкое", "неясно"}:
+        impact = "неясно"
+
+    if action not in {"urgent", "review", "monitor", "ignore"}:
+        action = "monitor"
+
+    return {
+        "relevance": relevance,
+        "impact": impact,
+        "action": action,
+        "summary": summary,
+        "why_it_matters": why_it_matters,
+        "title": title,
+        "ai_debug": "ok",
+    }
 
-Низкая relevance для:
-- кадров
-- служебного поведения
-- конфликта интересов
-- соцгарантий
-- конкурсов
-- вступительных испытаний
-- внутренних оргвопросов
-- гражданской обороны без ИБ-компонента
 
-IMPACT:
-- высокое
-- среднее
-- низкое
-- неясно
+def ai_item_source_block(item: Item) -> str:
+    preview = item.content_preview[:2500] if item.content_preview else ""
+    return f"""
+Заголовок: {item.title}
+Ссылка: {item.url}
+Тип источника: {item.source_type}
+Текст:
+{preview if preview else "Нет доступного текста, есть только заголовок и ссылка."}
+""".strip()
 
-Высокое impact:
-- если документ явно устанавливает, меняет или усиливает обязательные требования, формы, контроль, отчетность, реестры, процедуры надзора или меры защиты, которые могут затронуть организации
 
-Среднее impact:
-- если тема профильная, но по доступному тексту не видно масштаба изменений
+async def analyze_with_openai(
+    client: AsyncOpenAI,
+    regulator: str,
+    item: Item,
+    sem: asyncio.Semaphore,
+) -> Dict[str, str]:
+    fallback = ai_fallback(item)
 
-Низкое impact:
-- если документ технический, внутренний, узкий или почти не влияет на внешние организации
+    if not OPENAI_API_KEY:
+        fallback["ai_debug"] = "OPENAI_API_KEY не задан"
+        return fallback
 
-ACTION:
-- urgent -> если документ явно требует быстрого внимания
-- review -> если документ точно стоит изучить
-- monitor -> если документ потенциально полезен, но влияние пока неочевидно
-- ignore -> если документ не несет практической ценности для ИБ-мониторинга
+    prompt = f"""
+Ты анализируешь нормативную публикацию для Telegram-бота мониторинга НПА.
 
-НЕ ДОДУМЫВАЙ.
-Если нет достаточного текста — честно ставь "неясно".
+Нужно вернуть 6 полей:
+{AI_ANALYSIS_RULES}
 
 ИСХОДНЫЕ ДАННЫЕ:
 Регулятор: {regulator}
-Заголовок: {item.title}
-Ссылка: {item.url}
-Тип источника: {item.source_type}
-Текст:
-{preview if preview else "Нет доступного текста, есть только заголовок и ссылка."}
+{ai_item_source_block(item)}
 
 Верни СТРОГО JSON без markdown:
 
@@ -959,50 +1457,121 @@ ACTION:
             fallback["ai_debug"] = "пустой ответ модели"
             return fallback
 
-        match = re.search(r"\{.*\}", raw, flags=re.DOTALL)
+        match = AI_JSON_OBJECT_RE.search(raw)
         if not match:
             fallback["ai_debug"] = f"ответ не похож на JSON: {raw[:300]}"
             return fallback
 
         try:
-            data = json.loads(match.group(0))
+            data = orjson.loads(match.group(0))
         except Exception as e:
             fallback["ai_debug"] = (
                 f"JSON parse error: {type(e).__name__}: {e}; raw={raw[:300]}"
             )
             return fallback
 
-        title = clean_title(str(data.get("title", item.title)).strip()) or item.title
-        relevance = str(data.get("relevance", "неясно")).strip().lower()
-        impact = str(data.get("impact", "неясно")).strip().lower()
-        action = str(data.get("action", "monitor")).strip().lower()
-        summary = normalize_spaces(str(data.get("summary", "Описание не получено")).strip())
-        why_it_matters = normalize_spaces(
-            str(data.get("why_it_matters", "Практическая значимость не определена.")).strip()
-        )
+        return normalize_ai_result(data, item)
 
-        if relevance not in {"высокая", "средняя", "низкая", "неясно"}:
-            relevance = "неясно"
+    except Exception as e:
+        fallback["ai_debug"] = f"{type(e).__name__}: {e}"
+        return fallback
 
-        if impact not in {"высокое", "среднее", "низкое", "неясно"}:
-            impact = "неясно"
 
-        if action not in {"urgent", "review", "monitor", "ignore"}:
-            action = "monitor"
+async def analyze_batch_with_openai(
+    client: AsyncOpenAI,
+    regulator: str,
+    items: List[Item],
+    sem: asyncio.Semaphore,
+) -> List[Dict[str, str]]:
+    if not OPENAI_API_KEY:
+        return [ai_fallback(item, "OPENAI_API_KEY не задан") for item in items]
 
-        return {
-            "relevance": relevance,
-            "impact": impact,
-            "action": action,
-            "summary": summary,
-            "why_it_matters": why_it_matters,
-            "title": title,
-            "ai_debug": "ok",
-        }
+    async def analyze_each(batch_items: List[Item]) -> List[Dict[str, str]]:
+        return list(await asyncio.gather(
+            *(analyze_with_openai(client, regulator, item, sem) for item in batch_items)
+        ))
+
+    sources = "\n\n".join(
+        f"[{i}]\n{ai_item_source_block(item)}" for i, item in enumerate(items, 1)
+    )
+
+    prompt = f"""
+Ты анализируешь нормативные публикации для Telegram-бота мониторинга НПА.
+
+Для КАЖДОЙ публикации нужно вернуть 6 полей:
+{AI_ANALYSIS_RULES}
+
+Каждую публикацию оценивай отдельно, не переноси факты между ними.
+
+ИСХОДНЫЕ ДАННЫЕ:
+Регулятор: {regulator}
+
+{sources}
+
+Верни СТРОГО JSON-массив без markdown, по одному объекту на каждую публикацию,
+где id — номер публикации в квадратных скобках:
+
+[
+  {{
+    "id": 1,
+    "relevance": "высокая|средняя|низкая|неясно",
+    "impact": "высокое|среднее|низкое|неясно",
+    "action": "urgent|review|monitor|ignore",
+    "summary": "1-2 предложения только по фактам из доступного текста",
+    "why_it_matters": "одно короткое предложение по сути практической значимости",
+    "title": "короткий понятный заголовок без фантазий"
+  }}
+]
+""".strip()
+
+    try:
+        async with sem:
+            response = await client.responses.create(
+                model=OPENAI_MODEL,
+                input=prompt,
+            )
+
+        raw = (response.output_text or "").strip()
+        if not raw:
+            return [ai_fallback(item, "пустой ответ модели") for item in items]
+
+        match = AI_JSON_ARRAY_RE.search(raw)
+        if not match:
+            return await analyze_each(items)
+
+        try:
+            data = orjson.loads(match.group(0))
+        except Exception:
+            return await analyze_each(items)
+
+        by_id: Dict[int, Dict[str, Any]] = {}
+        if isinstance(data, list):
+            for entry in data:
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    by_id[int(entry.get("id"))] = entry
+                except (TypeError, ValueError):
+                    continue
+
+        missing_ids = [i for i in range(1, len(items) + 1) if i not in by_id]
+        retried: Dict[int, Dict[str, str]] = {}
+        if missing_ids:
+            retried_results = await analyze_each([items[i - 1] for i in missing_ids])
+            retried = dict(zip(missing_ids, retried_results))
+
+        results: List[Dict[str, str]] = []
+        for i, item in enumerate(items, 1):
+            entry = by_id.get(i)
+            if entry is None:
+                results.append(retried[i])
+            else:
+                results.append(normalize_ai_result(entry, item))
+        return results
 
     except Exception as e:
-        fallback["ai_debug"] = f"{type(e).__name__}: {e}"
-        return fallback
+        debug = f"{type(e).__name__}: {e}"
+        return [ai_fallback(item, debug) for item in items]
 
 
 def should_send_after_ai(item: Dict[str, str], regulator: str) -> bool:
@@ -1050,191 +1619,283 @@ def format_message(regulator: str, analyzed_items: List[Dict[str, str]]) -> str:
     return "\n".join(lines).strip()
 
 
+def split_message(text: str, limit: int) -> List[str]:
+    chunks: List[str] = []
+    t = text.strip()
+    pos = 0
+    n = len(t)
+    while pos < n:
+        end = min(pos + limit, n)
+        if end < n:
+            last_nl = t.rfind("\n", pos, end)
+            if last_nl - pos > 800:
+                end = last_nl
+        chunks.append(t[pos:end])
+        pos = end
+        while pos < n and t[pos] == "\n":
+            pos += 1
+    return chunks
+
+
 async def send_tg(session: aiohttp.ClientSession, text: str) -> None:
     if not BOT_TOKEN or not CHAT_ID:
         raise RuntimeError("BOT_TOKEN/CHAT_ID не заданы в env")
 
     url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
 
-    chunks = []
-    t = text.strip()
-    while t:
-        chunk = t[:TELEGRAM_MAX_CHARS]
-        if len(t) > TELEGRAM_MAX_CHARS:
-            last_nl = chunk.rfind("\n")
-            if last_nl > 800:
-                chunk = chunk[:last_nl]
-        chunks.append(chunk)
-        t = t[len(chunk):].lstrip("\n")
-
-    for part in chunks:
+    for part in split_message(text, TELEGRAM_MAX_CHARS):
         payload = {
             "chat_id": CHAT_ID,
             "text": part,
             "disable_web_page_preview": True,
         }
+        payload_bytes = orjson.dumps(payload)
+
+        async def request() -> None:
+            await pace_host(url)
+            async with session.post(
+                url,
+                data=payload_bytes,
+                headers={"Content-Type": "application/json"},
+            ) as r:
+                if r.status < 400:
+                    return
+                body = await r.text(errors="ignore")
+                if r.status == 429:
+                    m = TG_RETRY_AFTER_RE.search(body)
+                    retry_after = (
+                        float(m.group(1)) if m
+                        else parse_retry_after(r.headers.get("Retry-After"))
+                    ) or 3.0
+                    bucket = host_token_bucket(url)
+                    if bucket is not None:
+                        bucket.pause(retry_after)
+                        retry_after = 0.0
+                    raise RateLimitedHTTPError(f"Telegram 429: {body}", retry_after)
+                raise RuntimeError(f"Telegram error {r.status}: {body}")
+
+        await with_retries(
+            request,
+            retries=TELEGRAM_RETRIES,
+            deadline=None,
+            retry_after_max=None,
+        )
 
-        last_err = None
-        for attempt in range(1, TELEGRAM_RETRIES + 1):
-            try:
-                async with session.post(url, json=payload) as r:
-                    body = await r.text()
-                    if r.status == 429:
-                        m = re.search(r"retry after (\d+)", body, flags=re.IGNORECASE)
-                        wait_s = int(m.group(1)) if m else (2 + attempt)
-                        await asyncio.sleep(wait_s)
-                        raise RuntimeError(f"Telegram 429: {body}")
-                    if r.status >= 400:
-                        raise RuntimeError(f"Telegram error {r.status}: {body}")
-                    break
-            except Exception as e:
-                last_err = e
-                if attempt < TELEGRAM_RETRIES:
-                    await asyncio.sleep(1.2 * attempt)
+
+async def process_regulator(
+    session: aiohttp.ClientSession,
+    openai_client: Optional[AsyncOpenAI],
+    ai_sem: asyncio.Semaphore,
+    send_lock: asyncio.Lock,
+    state: Dict[str, Any],
+    regulator: str,
+    all_items: List[Item],
+    errors: List[Tuple[str, str]],
+) -> None:
+    seen_map = state["seen"].setdefault(regulator, {})
+    new_items: List[Item] = [it for it in all_items if item_seen_key(it) not in seen_map]
+
+    if regulator == "Проекты НПА":
+        new_items.sort(key=projects_npa_score, reverse=True)
+
+    skipped_items: List[Item] = []
+    prefiltered_items: List[Item] = []
+    for it in new_items:
+        if prefilter_item(it, regulator):
+            prefiltered_items.append(it)
+        else:
+            skipped_items.append(it)
+
+    analyzed_items: List[Dict[str, str]] = []
+    analyzed_source_items: List[Item] = []
+
+    if prefiltered_items:
+        if openai_client:
+            batches = [
+                prefiltered_items[i:i + OPENAI_BATCH_SIZE]
+                for i in range(0, len(prefiltered_items), OPENAI_BATCH_SIZE)
+            ]
+            tasks = [
+                analyze_batch_with_openai(openai_client, regulator, batch, ai_sem)
+                for batch in batches
+            ]
+            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            ai_results: List[Any] = []
+            for batch, batch_result in zip(batches, batch_results):
+                if isinstance(batch_result, Exception):
+                    ai_results.extend([batch_result] * len(batch))
+                else:
+                    ai_results.extend(batch_result)
+
+            for item, ai_result in zip(prefiltered_items, ai_results):
+                analyzed_source_items.append(item)
+                if isinstance(ai_result, Exception):
+                    analyzed_items.append({
+                        "title": item.title,
+                        "relevance": "ошибка AI",
+                        "impact": "неясно",
+                        "action": "monitor",
+                        "summary": "Исключение верхнего уровня в AI-анализе",
+                        "why_it_matters": "Не удалось получить вывод по документу.",
+                        "url": item.url,
+                        "ai_debug": f"{type(ai_result).__name__}: {ai_result}",
+                    })
                 else:
-                    raise RuntimeError(str(last_err))
+                    analyzed_items.append({
+                        "title": ai_result.get("title", item.title),
+                        "relevance": ai_result.get("relevance", "ошибка AI"),
+                        "impact": ai_result.get("impact", "неясно"),
+                        "action": ai_result.get("action", "monitor"),
+                        "summary": ai_result.get("summary", "AI-анализ не выполнен"),
+                        "why_it_matters": ai_result.get(
+                            "why_it_matters",
+                            "Практическая значимость не определена."
+                        ),
+                        "url": item.url,
+                        "ai_debug": ai_result.get("ai_debug", "no-debug"),
+                    })
+        else:
+            for item in prefiltered_items:
+                analyzed_source_items.append(item)
+                analyzed_items.append({
+                    "title": item.title,
+                    "relevance": "ошибка AI",
+                    "impact": "неясно",
+                    "action": "monitor",
+                    "summary": "OpenAI API не подключен",
+                    "why_it_matters": "API ключ OpenAI не найден.",
+                    "url": item.url,
+                    "ai_debug": "OPENAI_API_KEY не найден",
+                })
+
+    final_items = [it for it in analyzed_items if should_send_after_ai(it, regulator)]
+
+    sent_source_items: List[Item] = []
+    not_sent_source_items: List[Item] = []
+
+    if analyzed_items:
+        final_urls = {it["url"] for it in final_items}
+        sent_source_items = [it for it in analyzed_source_items if it.url in final_urls]
+        not_sent_source_items = [it for it in analyzed_source_items if it.url not in final_urls]
+
+    if final_items:
+        msg = format_message(regulator, final_items)
+        async with send_lock:
+            await send_tg(session, msg)
+        mark_seen_many(state, regulator, sent_source_items)
+
+    if skipped_items:
+        mark_seen_many(state, regulator, skipped_items)
+
+    if not_sent_source_items:
+        mark_seen_many(state, regulator, not_sent_source_items)
+
+    if errors and not prefiltered_items and should_send_error(state, regulator):
+        lines = []
+        lines.append("Мониторинг НПА")
+        lines.append(f"Регулятор: {regulator}")
+        lines.append(f"Дата: {now_msk_str()}")
+        lines.append("Ошибки источников:")
+        lines.append("")
+        for (u, e) in errors[:5]:
+            lines.append(f"- Источник: {u}")
+            lines.append(f"  Причина: {e}")
+        async with send_lock:
+            await send_tg(session, "\n".join(lines))
 
 
 async def main():
     sources = load_sources()
     state = load_state()
+    http_cache = load_http_cache()
 
-    timeout = ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+    timeout = ClientTimeout(
+        total=HTTP_TIMEOUT_SECONDS,
+        sock_connect=HTTP_CONNECT_TIMEOUT_SECONDS,
+    )
     headers = {
         "User-Agent": USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "ru,en;q=0.8",
     }
 
-    openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+    openai_client = (
+        AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=OPENAI_TIMEOUT_SECONDS)
+        if OPENAI_API_KEY
+        else None
+    )
     ai_sem = asyncio.Semaphore(OPENAI_MAX_CONCURRENT)
 
-    async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-        regulator_to_urls: Dict[str, List[str]] = {}
-        for s in sources:
-            reg = str(s["regulator"]).strip()
-            urls = [normalize_url(u) for u in s["urls"]]
-            regulator_to_urls.setdefault(reg, [])
-            regulator_to_urls[reg].extend(urls)
-
-        for regulator, urls in regulator_to_urls.items():
-            all_items: List[Item] = []
-            errors: List[Tuple[str, str]] = []
-
-            for u in urls:
-                items, err = await collect_items_for_source(session, regulator, u)
-                if err:
-                    errors.append((u, err))
-                else:
-                    all_items.extend(items)
-
-                if regulator == "Проекты НПА":
-                    break
-
-            uniq: Dict[str, Item] = {}
-            for it in all_items:
-                if regulator != "Проекты НПА" and is_drop_url(it.url):
-                    continue
-                uniq_key = item_seen_key(it)
-                if uniq_key not in uniq:
-                    uniq[uniq_key] = it
-
-            new_items: List[Item] = [it for it in uniq.values() if not has_seen(state, regulator, it)]
+    connector = aiohttp.TCPConnector(
+        resolver=aiohttp.AsyncResolver(),
+        limit=HTTP_MAX_CONNECTIONS,
+        limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        enable_cleanup_closed=True,
+    )
 
-            if regulator == "Проекты НПА":
-                new_items.sort(key=projects_npa_score, reverse=True)
-
-            skipped_items: List[Item] = [it for it in new_items if not prefilter_item(it, regulator)]
-            prefiltered_items: List[Item] = [it for it in new_items if prefilter_item(it, regulator)]
-
-            analyzed_items: List[Dict[str, str]] = []
-            analyzed_source_items: List[Item] = []
-
-            if prefiltered_items:
-                if openai_client:
-                    tasks = [
-                        analyze_with_openai(openai_client, regulator, item, ai_sem)
-                        for item in prefiltered_items
-                    ]
-                    ai_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    for item, ai_result in zip(prefiltered_items, ai_results):
-                        analyzed_source_items.append(item)
-                        if isinstance(ai_result, Exception):
-                            analyzed_items.append({
-                                "title": item.title,
-                                "relevance": "ошибка AI",
-                                "impact": "неясно",
-                                "action": "monitor",
-                                "summary": "Исключение верхнего уровня в AI-анализе",
-                                "why_it_matters": "Не удалось получить вывод по документу.",
-                                "url": item.url,
-                                "ai_debug": f"{type(ai_result).__name__}: {ai_result}",
-                            })
-                        else:
-                            analyzed_items.append({
-                                "title": ai_result.get("title", item.title),
-                                "relevance": ai_result.get("relevance", "ошибка AI"),
-                                "impact": ai_result.get("impact", "неясно"),
-                                "action": ai_result.get("action", "monitor"),
-                                "summary": ai_result.get("summary", "AI-анализ не выполнен"),
-                                "why_it_matters": ai_result.get(
-                                    "why_it_matters",
-                                    "Практическая значимость не определена."
-                                ),
-                                "url": item.url,
-                                "ai_debug": ai_result.get("ai_debug", "no-debug"),
-                            })
-                else:
-                    for item in prefiltered_items:
-                        analyzed_source_items.append(item)
-                        analyzed_items.append({
-                            "title": item.title,
-                            "relevance": "ошибка AI",
-                            "impact": "неясно",
-                            "action": "monitor",
-                            "summary": "OpenAI API не подключен",
-                            "why_it_matters": "API ключ OpenAI не найден.",
-                            "url": item.url,
-                            "ai_debug": "OPENAI_API_KEY не найден",
-                        })
-
-            final_items = [it for it in analyzed_items if should_send_after_ai(it, regulator)]
-
-            sent_source_items: List[Item] = []
-            not_sent_source_items: List[Item] = []
-
-            if analyzed_items:
-                final_urls = {it["url"] for it in final_items}
-                sent_source_items = [it for it in analyzed_source_items if it.url in final_urls]
-                not_sent_source_items = [it for it in analyzed_source_items if it.url not in final_urls]
-
-            if final_items:
-                msg = format_message(regulator, final_items)
-                await send_tg(session, msg)
-                mark_seen_many(state, regulator, sent_source_items)
-
-            if skipped_items:
-                mark_seen_many(state, regulator, skipped_items)
-
-            if not_sent_source_items:
-                mark_seen_many(state, regulator, not_sent_source_items)
-
-            if errors and not prefiltered_items and should_send_error(state, regulator):
-                lines = []
-                lines.append("Мониторинг НПА")
-                lines.append(f"Регулятор: {regulator}")
-                lines.append(f"Дата: {now_msk_str()}")
-                lines.append("Ошибки источников:")
-                lines.append("")
-                for (u, e) in errors[:5]:
-                    lines.append(f"- Источник: {u}")
-                    lines.append(f"  Причина: {e}")
-                await send_tg(session, "\n".join(lines))
+    try:
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers=headers,
+        ) as session:
+            regulator_to_urls: Dict[str, List[str]] = {}
+            for s in sources:
+                reg = str(s["regulator"]).strip()
+                urls = [normalize_url(u) for u in s["urls"]]
+                regulator_to_urls.setdefault(reg, [])
+                regulator_to_urls[reg].extend(urls)
+
+            source_urls = {u for urls in regulator_to_urls.values() for u in urls}
+            for cached_url in list(http_cache.keys()):
+                if cached_url not in source_urls:
+                    http_cache.pop(cached_url, None)
+
+            collected = await collect_all_sources(session, regulator_to_urls, state, http_cache)
+            save_json_file(HTTP_CACHE_FILE, http_cache)
+
+            send_lock = asyncio.Lock()
+            save_lock = asyncio.Lock()
+
+            async def process_and_save(
+                regulator: str,
+                all_items: List[Item],
+                errors: List[Tuple[str, str]],
+            ) -> None:
+                await process_regulator(
+                    session,
+                    openai_client,
+                    ai_sem,
+                    send_lock,
+                    state,
+                    regulator,
+                    all_items,
+                    errors,
+                )
+                async with save_lock:
+                    await asyncio.to_thread(save_json_file, STATE_FILE, state)
+
+            results = await asyncio.gather(
+                *(
+                    process_and_save(regulator, all_items, errors)
+                    for regulator, (all_items, errors) in collected.items()
+                ),
+                return_exceptions=True,
+            )
+    finally:
+        if openai_client:
+            await openai_client.close()
 
     compact_seen(state, keep_days=45)
     save_json_file(STATE_FILE, state)
 
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    uvloop.run(main())
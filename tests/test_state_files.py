@@ -0,0 +1,31 @@
+import os
+import unittest
+
+import main
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StateFilesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cwd = os.getcwd()
+        os.chdir(REPO_ROOT)
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+
+    def test_load_sources(self) -> None:
+        sources = main.load_sources()
+        self.assertTrue(sources)
+        for s in sources:
+            self.assertTrue(str(s["regulator"]).strip())
+            self.assertTrue(s["urls"])
+
+    def test_load_state(self) -> None:
+        state = main.load_state()
+        self.assertIsInstance(state["seen"], dict)
+        self.assertIsInstance(state["error_notified_at"], dict)
+
+
+if __name__ == "__main__":
+    unittest.main()